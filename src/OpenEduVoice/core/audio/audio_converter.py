@@ -13,6 +13,10 @@ from pydub import AudioSegment
 from OpenEduVoice.utils.logging_utils import safe_log
 
 SUPPORTED_INPUT_SUFFIXES = (".mp3", ".aac", ".wma", ".m4a", ".wav")
+# Whisper's input format (16 kHz mono). WAVs already in it are read directly by the
+# transcriber instead of being decoded and resampled again by faster-whisper.
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
 
 
 def convert_audio_to_wav(
@@ -21,7 +25,7 @@ def convert_audio_to_wav(
     log_fn: Callable[[str], None] = print,
 ) -> List[Path]:
     """
-    Converts all supported audio files in input_dir to .wav format.
+    Converts all supported audio files in input_dir to 16 kHz mono .wav format.
 
     Args:
         input_dir: Directory containing input audio files.
@@ -43,6 +47,7 @@ def convert_audio_to_wav(
         try:
             audio = AudioSegment.from_file(file_path)  # ffmpeg detects codec/format
             wav_path = output_dir / f"{file_path.stem}.wav"
+            audio = audio.set_frame_rate(TARGET_SAMPLE_RATE).set_channels(TARGET_CHANNELS)
             audio.export(wav_path, format="wav")  # default PCM 16-bit
             converted_files.append(wav_path)
             safe_log(log_fn, f"[INFO] Converted: {file_path.name} -> {wav_path.name}")
@@ -9,26 +9,60 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from types import MappingProxyType
 from typing import Callable, List, Optional
 
+from OpenEduVoice.utils.hardware import cuda_total_gib, physical_cpu_count
 from OpenEduVoice.utils.logging_utils import safe_log
 
 DEFAULT_WHISPER_MODEL = "medium"
 UNSAFE_LARGE_MODELS = {"large", "large-v2"}
+# GPUs with less memory than this load int8 weights (int8_float16) instead of float16.
+LOW_VRAM_GIB = 6.0
+# Number of WAV files transcribed concurrently (one shared model, N CTranslate2 workers).
+DEFAULT_TRANSCRIBE_WORKERS = 2
+
+# Decoding options shared by every file; built once instead of per call.
+_TRANSCRIBE_KWARGS = MappingProxyType({
+    "language": "de",
+    "beam_size": 5,
+    "best_of": 5,
+    "temperature": (0.0, 0.2, 0.4, 0.6, 0.8),
+    "vad_filter": True,
+    # Lecture audio has long pauses; skip them before feature extraction/encoding.
+    # (plain dict: faster-whisper only converts dict instances to VadOptions)
+    "vad_parameters": {"min_silence_duration_ms": 500, "speech_pad_ms": 200},
+    "condition_on_previous_text": True,
+})
 
 try:
     from faster_whisper import WhisperModel  # type: ignore
 except Exception:  # pragma: no cover
     WhisperModel = None  # allow tests to monkeypatch
 
-def _cuda_wheels_present() -> bool:
+try:
+    import soundfile as sf  # type: ignore
+except Exception:  # pragma: no cover
+    sf = None
+
+# faster-whisper's feature extractor works on 16 kHz mono float32 samples.
+WHISPER_SAMPLE_RATE = 16000
+
+# Loaded models keyed by (model, device, preferred compute_type, CTranslate2 workers).
+# Reloading Whisper weights costs seconds, so repeated GUI runs reuse them.
+_MODEL_CACHE: dict[tuple, "WhisperModel"] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+def _find_cuda_wheel_dirs() -> tuple[Path, ...]:
     """
-    Returns True if pip-installed NVIDIA CUDA wheel DLL dirs exist in this venv.
-    On Windows this is a strong signal that cublas/cudnn DLLs can actually be loaded.
+    Existing DLL folders of pip-installed NVIDIA CUDA wheels in this venv (Windows only).
+    Never raises.
     """
     if os.name != "nt":
-        return False
+        return ()
 
     try:
         venv_base = Path(sys.executable).parent.parent
@@ -38,9 +72,21 @@ def _cuda_wheels_present() -> bool:
             nvidia_path / "cublas" / "bin",
             nvidia_path / "cudnn" / "bin",
         ]
-        return any(p.exists() for p in candidates)
+        return tuple(p for p in candidates if p.exists())
     except Exception:
-        return False
+        return ()
+
+
+# The venv layout doesn't change while the app runs; probe the filesystem once.
+_CUDA_WHEEL_DIRS: tuple[Path, ...] = _find_cuda_wheel_dirs()
+
+
+def _cuda_wheels_present() -> bool:
+    """
+    Returns True if pip-installed NVIDIA CUDA wheel DLL dirs exist in this venv.
+    On Windows this is a strong signal that cublas/cudnn DLLs can actually be loaded.
+    """
+    return bool(_CUDA_WHEEL_DIRS)
 
 
 def _torch_cuda_available() -> bool:
@@ -55,6 +101,20 @@ def _torch_cuda_available() -> bool:
         return False
 
 
+def _preferred_cpu_compute() -> str:
+    """
+    Prefer int8 weights with float32 activations when CTranslate2 reports support
+    for it on this CPU (AVX2+); otherwise plain int8. Never raises.
+    """
+    try:
+        import ctranslate2  # installed alongside faster-whisper
+        if "int8_float32" in ctranslate2.get_supported_compute_types("cpu"):
+            return "int8_float32"
+    except Exception:
+        pass
+    return "int8"
+
+
 def _select_device_and_compute(model_name: str) -> tuple[str, str]:
     """
     CPU-first default. Only use CUDA when BOTH:
@@ -63,11 +123,14 @@ def _select_device_and_compute(model_name: str) -> tuple[str, str]:
     """
     cuda_ok = _torch_cuda_available()
     if cuda_ok:
-        # On CUDA, float16 is usually the right default for speed.
+        # On CUDA, float16 is usually the right default for speed. Small GPUs get
+        # int8 weights up front instead of OOM-ing later and forcing a reload.
+        if 0.0 < cuda_total_gib() < LOW_VRAM_GIB:
+            return "cuda", "int8_float16"
         return "cuda", "float16"
 
-    # CPU fallback. int8 is typically fastest/most memory-friendly on CPU.
-    return "cpu", "int8"
+    # CPU fallback. int8 weights are typically fastest/most memory-friendly on CPU.
+    return "cpu", _preferred_cpu_compute()
 
 def set_cuda_paths(log_fn: Optional[Callable[[str], None]] = None) -> None:
     """
@@ -78,14 +141,7 @@ def set_cuda_paths(log_fn: Optional[Callable[[str], None]] = None) -> None:
         return
 
     try:
-        venv_base = Path(sys.executable).parent.parent
-        nvidia_path = venv_base / "Lib" / "site-packages" / "nvidia"
-        candidates = [
-            nvidia_path / "cuda_runtime" / "bin",
-            nvidia_path / "cublas" / "bin",
-            nvidia_path / "cudnn" / "bin",
-        ]
-        to_prepend = [str(p) for p in candidates if p.exists()]
+        to_prepend = [str(p) for p in _CUDA_WHEEL_DIRS]
 
         if not to_prepend:
             return
@@ -102,7 +158,10 @@ def set_cuda_paths(log_fn: Optional[Callable[[str], None]] = None) -> None:
     except Exception as e:
         safe_log(log_fn, f"[WARN] set_cuda_paths failed (continuing without): {e}")
 
-def _init_model(model_size: str, log_fn: Optional[Callable[[str], None]]) -> "WhisperModel":
+def _init_model(
+    model_size: str,
+    log_fn: Optional[Callable[[str], None]],
+) -> "WhisperModel":
     """
     Initialize WhisperModel with:
     - Deterministic device selection:
@@ -110,6 +169,10 @@ def _init_model(model_size: str, log_fn: Optional[Callable[[str], None]]) -> "Wh
         * Otherwise use CPU.
     - Safety guard: never run large/large-v2 on CUDA (fallback to DEFAULT_WHISPER_MODEL).
     - Graceful fallbacks for compute_type on the chosen device.
+    - On CPU, DEFAULT_TRANSCRIBE_WORKERS CTranslate2 workers; physical CPU cores are
+      split between them so intra-op threads don't oversubscribe the machine. On CUDA
+      a single worker: each extra worker adds GPU memory. The worker count depends
+      only on the device, so every caller shares one cached model per model/device.
     """
     if WhisperModel is None:
         raise RuntimeError("faster-whisper is not installed or failed to import.")
@@ -139,57 +202,153 @@ def _init_model(model_size: str, log_fn: Optional[Callable[[str], None]]) -> "Wh
     if device == "cuda":
         compute_candidates = [preferred_compute, "float32", "int8"]
     else:
-        compute_candidates = [preferred_compute, "float32"]
+        compute_candidates = [preferred_compute, "int8_float32", "int8", "float32"]
+    # De-dupe while keeping order so a failed compute type is never loaded twice
+    compute_candidates = list(dict.fromkeys(compute_candidates))
 
-    last_err: Optional[Exception] = None
+    model_workers = 1 if device == "cuda" else DEFAULT_TRANSCRIBE_WORKERS
+    cpu_threads = max(1, physical_cpu_count() // model_workers)
 
-    for compute_type in compute_candidates:
-        # De-dupe in case preferred_compute == "float32" etc.
-        if compute_candidates.count(compute_type) > 1:
-            # We'll let duplicates slide, it's harmless; but you can de-dupe if you want.
-            pass
-        try:
-            safe_log(
-                log_fn,
-                f"[INFO] Loading faster-whisper model '{effective_model}' "
-                f"on device '{device}' (compute_type={compute_type})",
-            )
-            model = WhisperModel(effective_model, device=device, compute_type=compute_type)
-            return model
-        except Exception as e:
-            last_err = e
+    cache_key = (effective_model, device, preferred_compute, model_workers)
+
+    # Lock spans the load so concurrent GUI tasks don't load the same model twice
+    with _MODEL_CACHE_LOCK:
+        cached = _MODEL_CACHE.get(cache_key)
+        if cached is not None:
             safe_log(
                 log_fn,
-                "[WARN] Model init failed with "
-                f"device={device}, compute_type={compute_type}, "
-                f"model='{effective_model}': {e}",
+                f"[INFO] Reusing loaded faster-whisper model '{effective_model}' on device '{device}'",
             )
+            return cached
+
+        last_err: Optional[Exception] = None
+
+        for compute_type in compute_candidates:
+            try:
+                safe_log(
+                    log_fn,
+                    f"[INFO] Loading faster-whisper model '{effective_model}' "
+                    f"on device '{device}' (compute_type={compute_type})",
+                )
+                model = WhisperModel(
+                    effective_model,
+                    device=device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=model_workers,
+                )
+                _MODEL_CACHE[cache_key] = model
+                return model
+            except Exception as e:
+                last_err = e
+                safe_log(
+                    log_fn,
+                    "[WARN] Model init failed with "
+                    f"device={device}, compute_type={compute_type}, "
+                    f"model='{effective_model}': {e}",
+                )
 
     raise RuntimeError(
         f"Failed to initialize faster-whisper model '{requested_model}' "
         f"on device '{device}': {last_err}"
     )
 
+def _load_audio(wav_file: Path):
+    """
+    Returns the WAV as a 16 kHz mono float32 ndarray when it is already at Whisper's
+    sample rate (skips faster-whisper's own decode pass). Otherwise returns the path
+    so faster-whisper decodes and resamples it. Never raises.
+    """
+    if sf is None:
+        return os.fspath(wav_file)
+    try:
+        if sf.info(os.fspath(wav_file)).samplerate != WHISPER_SAMPLE_RATE:
+            return os.fspath(wav_file)
+        audio, _ = sf.read(os.fspath(wav_file), dtype="float32", always_2d=True)
+        return audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    except Exception:
+        return os.fspath(wav_file)
+
+
+def _transcribe_one(
+    model: "WhisperModel",
+    wav_file: Path,
+    output_dir: Path,
+    log_fn: Optional[Callable[[str], None]],
+) -> Optional[Path]:
+    """
+    Transcribes a single WAV file and writes `<stem>.txt` into output_dir.
+    Returns the written path, or None on failure (errors are logged, never raised).
+    """
+    out_path = output_dir / f"{wav_file.stem}.txt"
+    try:
+        segments, _ = model.transcribe(_load_audio(wav_file), **_TRANSCRIBE_KWARGS)
+
+        # Stream segment texts to disk, space-separated, as the generator yields them
+        byte_count = 0
+        with open(out_path, "wb") as f:
+            for seg in segments:
+                text = seg.text.strip()
+                if not text:
+                    continue
+                if byte_count:
+                    f.write(b" ")
+                    byte_count += 1
+                # Encode once; the same bytes feed both the write and the size log
+                encoded = text.encode("utf-8")
+                f.write(encoded)
+                byte_count += len(encoded)
+        safe_log(log_fn, f"[INFO] Transcribed: {wav_file.name} -> {out_path.name} ({byte_count} bytes)")
+        return out_path
+    except Exception as e:
+        # Don't leave a half-written transcript behind
+        try:
+            out_path.unlink(missing_ok=True)
+        except Exception:
+            pass
+        safe_log(log_fn, f"[ERROR] Failed to transcribe {wav_file.name}: {e}")
+        return None
+
+
 def transcribe_audio_files(
     audio_dir: Path,
     output_dir: Path,
     model_size: str = DEFAULT_WHISPER_MODEL,
     log_fn: Callable[[str], None] = print,
+    workers: int = DEFAULT_TRANSCRIBE_WORKERS,
 ) -> List[Path]:
     """
     Transcribes all .wav files in a directory using faster-whisper.
 
+    Files are processed concurrently on a thread pool sharing one model;
+    CTranslate2 releases the GIL during inference.
+
     Args:
         audio_dir: Directory containing WAV files.
         output_dir: Directory to save transcription .txt files.
         model_size: Whisper model variant (e.g., 'base', 'medium').
         log_fn: Logging function (GUI logger or print).
+        workers: Maximum number of files transcribed at the same time.
 
     Returns:
-        List of saved .txt file paths.
+        List of saved .txt file paths (sorted by name).
     """
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+
+    transcribed_files: List[Path] = []
+    # Single scandir pass; DirEntry caches the file type from the directory read
+    try:
+        with os.scandir(audio_dir) as entries:
+            wav_files = sorted(
+                (Path(e.path) for e in entries if e.is_file() and e.name.lower().endswith(".wav")),
+                key=lambda p: p.name,
+            )
+    except FileNotFoundError:
+        wav_files = []
+    if not wav_files:
+        safe_log(log_fn, f"[INFO] No .wav files found in: {audio_dir}")
+        return transcribed_files
+
     # Only patch CUDA paths if CUDA wheels exist (prevents misleading logs in CPU mode)
     if _cuda_wheels_present() and _torch_cuda_available():
         set_cuda_paths(log_fn)
@@ -200,31 +359,18 @@ def transcribe_audio_files(
         safe_log(log_fn, f"[ERROR] Could not load Whisper model '{model_size}': {e}")
         return []
 
-    transcribed_files: List[Path] = []
-    wav_files = sorted(audio_dir.glob("*.wav"))
-    if not wav_files:
-        safe_log(log_fn, f"[INFO] No .wav files found in: {audio_dir}")
-        return transcribed_files
-
-    for wav_file in wav_files:
-        try:
-            segments, _ = model.transcribe(str(wav_file),
-                                        language="de",
-                                        beam_size=5,
-                                        best_of=5,
-                                        temperature=[0.0, 0.2, 0.4, 0.6, 0.8],
-                                        vad_filter=True,
-                                        condition_on_previous_text=True,                               
-            )
-            
-            # Concatenate segment texts with spaces (simple, reliable)
-            transcript = " ".join(getattr(s, "text", "") for s in segments).strip()
-            out_path = output_dir / f"{wav_file.stem}.txt"
-            out_path.write_text(transcript, encoding="utf-8")
-            transcribed_files.append(out_path)
-            safe_log(log_fn, f"[INFO] Transcribed: {wav_file.name} -> {out_path.name} ({len(transcript)} chars)")
-        except Exception as e:
-            safe_log(log_fn, f"[ERROR] Failed to transcribe {wav_file.name}: {e}")
+    # Only the thread count follows the file count; the cached model is shared as-is.
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(wav_files)))) as pool:
+        futures = [
+            pool.submit(_transcribe_one, model, wav_file, output_dir, log_fn)
+            for wav_file in wav_files
+        ]
+        for future in as_completed(futures):
+            out_path = future.result()
+            if out_path is not None:
+                transcribed_files.append(out_path)
 
+    # Keep deterministic ordering regardless of completion order
+    transcribed_files.sort()
     safe_log(log_fn, f"[INFO] Total transcripts written: {len(transcribed_files)}")
-    return transcribed_files
\ No newline at end of file
+    return transcribed_files
@@ -16,67 +16,299 @@ Notes:
 
 from __future__ import annotations
 
+import functools
+import importlib.util
 import os
 import re
+import threading
+import warnings
+import weakref
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+
+# PyTorch reads this once, when the CUDA caching allocator is initialized, so it has to
+# be set before any CUDA work. Only set if not already set by user/system.
+_ALLOC_CONF_KEY = "PYTORCH_CUDA_ALLOC_CONF"
+_ALLOC_CONF_VALUE = "expandable_segments:True"
+os.environ.setdefault(_ALLOC_CONF_KEY, _ALLOC_CONF_VALUE)
 
 import torch
 from transformers import NllbTokenizer, AutoModelForSeq2SeqLM
 
+from OpenEduVoice.utils.hardware import cuda_total_gib, physical_cpu_count
+
 
 # Good default for most laptops. Users with larger GPUs can override via config/UI.
 DEFAULT_MODEL_SMALL = "facebook/nllb-200-distilled-600M"
 DEFAULT_MODEL_LARGE = "facebook/nllb-200-3.3B"
 
+# Sentence boundary: whitespace following ., ! or ?
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+# Same boundaries via str.translate: mark every terminator with a sentinel, split in C.
+_SENT_SENTINEL = "\x01"
+_SENT_MARK = str.maketrans({".": ".\x01", "!": "!\x01", "?": "?\x01"})
+
+# Minimum VRAM (GiB) to auto-select / keep the 3.3B model on CUDA, by weight quantization.
+# FP16 needs ~6.6GB of weights plus activations; bitsandbytes int8 / NF4 shrink that.
+LARGE_MODEL_MIN_VRAM_GIB = {None: 16.0, "int8": 8.0, "nf4": 5.0}
+
+# Beam width per quality preset. Beam search multiplies decoder compute and KV-cache
+# memory by the beam count; greedy ("fast") is the interactive default.
+QUALITY_NUM_BEAMS = {"fast": 1, "high": 4}
+
+# With a compiled model on CUDA, inputs are padded up to one of these lengths so the
+# static KV cache / CUDA graphs only ever see a handful of shapes.
+INPUT_LENGTH_BUCKETS = (64, 128, 256, 512)
+
+# Encoder input is truncated to MAX_INPUT_TOKENS; each chunk generates at most MAX_NEW_TOKENS.
+MAX_INPUT_TOKENS = 512
+MAX_NEW_TOKENS = 256
+# Default chunk size in source tokens (NLLB's token/char ratio varies a lot by language).
+# Translations run up to ~1.5x the source length and must fit in MAX_NEW_TOKENS.
+MAX_CHUNK_TOKENS = 160
+
+# Chunks per generate() call. Bounds peak VRAM on 8GB GPUs while still batching.
+DEFAULT_BATCH_SIZE = 8
+
+# Inference backends: "hf" = transformers generate(), "ct2" = CTranslate2 (optional package).
+BACKENDS = ("hf", "ct2")
+# Converted CTranslate2 models (int8), one subdirectory per model name.
+CT2_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "OpenEduVoice", "ct2")
+
 
 @dataclass(frozen=True)
 class NLLBConfig:
     source_lang: str = "deu_Latn"
     target_lang: str = "eng_Latn"
     model_name: Optional[str] = None  # None => auto-select
-    max_chars: int = 400
-
-
-def _cuda_total_gib() -> float:
-    try:
-        if not torch.cuda.is_available():
-            return 0.0
-        props = torch.cuda.get_device_properties(0)
-        return float(props.total_memory) / (1024 ** 3)
-    except Exception:
-        return 0.0
-
-
-def _pick_model_name(requested: Optional[str]) -> str:
+    max_tokens: int = MAX_CHUNK_TOKENS
+    # torch.compile the forward pass (needs torch>=2.1 and a working Inductor backend,
+    # which Windows installs often lack). Off by default; falls back to eager on failure.
+    compile_model: bool = False
+    # Weight-only quantization via bitsandbytes (CUDA only): None, "int8" or "nf4".
+    quantization: Optional[str] = None
+    # Speed/quality tradeoff: "fast" = greedy, "high" = 4-beam search.
+    # An explicit num_beams overrides the preset.
+    quality: str = "fast"
+    num_beams: Optional[int] = None
+    # "ct2" runs the model with CTranslate2 (int8) instead of transformers, if installed.
+    backend: str = "hf"
+
+
+def _split_sentences(text: str) -> list[str]:
+    """
+    Equivalent to `_SENT_SPLIT_RE.split(text.strip())` (minus empty pieces), but the
+    scan runs in str.translate/str.split instead of the regex engine. A terminator only
+    ends a sentence when whitespace follows it, so "3.5" or "z.B." stay intact.
+    """
+    text = (text or "").strip()
+    if _SENT_SENTINEL in text:
+        return [s for s in _SENT_SPLIT_RE.split(text) if s]
+
+    sentences: list[str] = []
+    current = ""
+    for piece in text.translate(_SENT_MARK).split(_SENT_SENTINEL):
+        if current and piece[:1].isspace():
+            sentences.append(current)
+            current = piece.lstrip()
+        else:
+            current += piece
+    if current:
+        sentences.append(current)
+    return sentences
+
+
+def _pick_model_name(requested: Optional[str], quantization: Optional[str] = None) -> str:
     if requested:
         return requested
 
-    # Heuristic: 3.3B on CUDA generally needs more than 8GB VRAM.
+    # Heuristic: 3.3B on CUDA generally needs more than 8GB VRAM unless quantized.
     # Keep it conservative for reliability.
-    vram_gib = _cuda_total_gib()
-    if vram_gib >= 16.0:
+    vram_gib = cuda_total_gib()
+    if vram_gib >= LARGE_MODEL_MIN_VRAM_GIB[quantization]:
         return DEFAULT_MODEL_LARGE
     return DEFAULT_MODEL_SMALL
 
 
+def _quantization_config(quantization: str):
+    from transformers import BitsAndBytesConfig  # needs the optional `bitsandbytes` package
+
+    if quantization == "nf4":
+        # Weights stay 4-bit; matmuls run in bf16 where the GPU has native bf16
+        # (Ampere+), else fp16 like the rest of the CUDA model.
+        compute_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=compute_dtype,
+        )
+    return BitsAndBytesConfig(load_in_8bit=True)
+
+
 def _choose_device() -> torch.device:
     return torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
+def _cpu_supports_bf16() -> bool:
+    """
+    True if oneDNN reports native bf16 kernels on this CPU (AVX512-BF16/AMX).
+    Without them bf16 matmuls are emulated and slower than fp32.
+    """
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+def _has_accelerate() -> bool:
+    # `device_map=` in from_pretrained requires the optional `accelerate` package.
+    return importlib.util.find_spec("accelerate") is not None
+
+
+def _configure_cpu_threads() -> None:
+    """
+    Uses one intra-op thread per physical core for CPU inference, unless the user has
+    already configured threading via OMP_NUM_THREADS / MKL_NUM_THREADS.
+    """
+    if os.environ.get("OMP_NUM_THREADS") or os.environ.get("MKL_NUM_THREADS"):
+        return
+    torch.set_num_threads(physical_cpu_count())
+
+
+def _ipex_optimize(model):
+    """
+    Applies Intel Extension for PyTorch (optional package) operator fusion and weight
+    prepacking to a CPU model in eval() mode. Keeps the model's dtype: bf16 only where
+    _cpu_supports_bf16(), since emulated bf16 is slower than fp32.
+    Returns (model, optimized); the unmodified model if IPEX is missing or fails.
+    """
+    try:
+        import intel_extension_for_pytorch as ipex  # optional
+    except ImportError:
+        return model, False
+    try:
+        return ipex.optimize(model, dtype=model.dtype, inplace=True), True
+    except Exception:
+        return model, False
+
+
+def _has_ctranslate2() -> bool:
+    return importlib.util.find_spec("ctranslate2") is not None
+
+
 def _set_allocator_hints() -> None:
     """
     Helps reduce CUDA fragmentation issues in some workloads.
     Safe no-op if CUDA isn't used.
+
+    Kept for compatibility: the hint is now applied at import time. Setting it after
+    CUDA has been initialized has no effect, so that case only warns.
     """
+    if torch.cuda.is_initialized() and os.environ.get(_ALLOC_CONF_KEY) is None:
+        warnings.warn(
+            f"{_ALLOC_CONF_KEY} set after CUDA initialization has no effect.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
     # Only set if not already set by user/system
-    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+    os.environ.setdefault(_ALLOC_CONF_KEY, _ALLOC_CONF_VALUE)
+
+
+# Loaded models are shared process-wide (see _load_nllb); these track per-model one-time work.
+_LOAD_LOCK = threading.Lock()
+_COMPILED_MODELS: "weakref.WeakSet" = weakref.WeakSet()
+_WARMED_UP_MODELS: "weakref.WeakSet" = weakref.WeakSet()
+_IPEX_MODELS: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@functools.lru_cache(maxsize=2)
+def _load_nllb(model_name: str, device_str: str, quantization: Optional[str], compiled: bool = False):
+    """
+    Loads NLLB weights for (model, device, quantization) once per process and returns
+    (model, generate_lock). Models are frozen and in eval() mode, so translator
+    instances can share them; the lock serializes generate() calls on the shared model.
+    The tokenizer is not cached here: its src_lang is per-translator state.
+
+    `compiled` only separates cache entries: NLLBTranslator._compile() replaces the
+    shared model's forward, so compiled and eager translators must not share a model.
+    """
+    device = torch.device(device_str)
+
+    # Reduce peak memory during load: allocate weights directly in the target dtype.
+    # SDPA = PyTorch's fused attention (FlashAttention / mem-efficient kernels on CUDA).
+    model_kwargs = {"attn_implementation": "sdpa"}
+    if device.type == "cuda":
+        model_kwargs["torch_dtype"] = torch.float16
+    elif _cpu_supports_bf16():
+        model_kwargs["torch_dtype"] = torch.bfloat16
+    if quantization:
+        model_kwargs["quantization_config"] = _quantization_config(quantization)
+    if quantization or _has_accelerate():
+        # With a device_map, from_pretrained builds the model on the meta device
+        # (accelerate's init_empty_weights) and streams each checkpoint shard straight
+        # to the target device; no full CPU copy. Quantized weights can't be moved with
+        # .to() anyway, so they must be placed this way.
+        model_kwargs["device_map"] = {"": device}
+    else:
+        model_kwargs["low_cpu_mem_usage"] = True
+
+    try:
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, **model_kwargs)
+    except (TypeError, ValueError, ImportError):
+        # Older transformers don't know the argument or lack SDPA for this architecture.
+        model_kwargs.pop("attn_implementation")
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, **model_kwargs)
+    if "device_map" not in model_kwargs:
+        model.to(device)
+    model.eval()
+    # Inference only: no parameter ever needs autograd tracking.
+    model.requires_grad_(False)
+    if device.type == "cpu":
+        _configure_cpu_threads()
+        model, optimized = _ipex_optimize(model)
+        if optimized:
+            _IPEX_MODELS.add(model)
+    return model, threading.Lock()
+
+
+def _ct2_model_dir(model_name: str) -> str:
+    """
+    Returns the CTranslate2 copy of `model_name` under CT2_CACHE_DIR, converting the
+    HF checkpoint (int8 weights) on first use. Conversion goes to a temporary directory
+    that is renamed when complete, so an interrupted run never leaves a half model.
+    """
+    model_dir = os.path.join(CT2_CACHE_DIR, re.sub(r"[^\w.-]+", "--", model_name))
+    if os.path.isfile(os.path.join(model_dir, "model.bin")):
+        return model_dir
+
+    from ctranslate2.converters import TransformersConverter
+
+    os.makedirs(CT2_CACHE_DIR, exist_ok=True)
+    tmp_dir = model_dir + ".tmp"
+    TransformersConverter(model_name).convert(tmp_dir, quantization="int8", force=True)
+    os.replace(tmp_dir, model_dir)
+    return model_dir
+
+
+@functools.lru_cache(maxsize=2)
+def _load_ct2(model_name: str, device_str: str):
+    """
+    Loads the CTranslate2 translator for (model, device) once per process. Unlike the
+    HF model it needs no generate lock: ctranslate2.Translator is thread-safe.
+    """
+    import ctranslate2
+
+    compute_type = "int8_float16" if device_str == "cuda" else "int8"
+    return ctranslate2.Translator(_ct2_model_dir(model_name), device=device_str, compute_type=compute_type)
 
 
 class NLLBTranslator:
     """
     Wrapper around the NLLB-200 model for translating text between supported languages.
     Automatically loads the tokenizer and model and moves it to the appropriate device (CUDA/CPU).
+    Model weights are shared between translators using the same model/device/quantization
+    and compile_model setting.
+    With backend="ct2" the model runs on CTranslate2; the HF tokenizer is still used.
     """
 
     def __init__(
@@ -85,118 +317,426 @@ class NLLBTranslator:
         target_lang: str = "eng_Latn",
         model_name: Optional[str] = None,
         log: Optional[Callable[[str], None]] = None,
+        compile_model: bool = False,
+        quantization: Optional[str] = None,
+        quality: str = "fast",
+        num_beams: Optional[int] = None,
+        backend: str = "hf",
     ) -> None:
+        if quantization not in LARGE_MODEL_MIN_VRAM_GIB:
+            raise ValueError(f"Unsupported NLLB quantization: {quantization!r} (use None, 'int8' or 'nf4')")
+        if quality not in QUALITY_NUM_BEAMS:
+            raise ValueError(f"Unsupported NLLB quality preset: {quality!r} (use 'fast' or 'high')")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported NLLB backend: {backend!r} (use 'hf' or 'ct2')")
+        self.num_beams = max(1, num_beams or QUALITY_NUM_BEAMS[quality])
+
+        if backend == "ct2" and not _has_ctranslate2():
+            if log:
+                log("[WARN] CTranslate2 is not installed; using the transformers backend.")
+            backend = "hf"
+        if backend == "ct2" and quantization:
+            if log:
+                log(f"[WARN] NLLB quantization '{quantization}' is ignored: the CTranslate2 backend uses int8.")
+            quantization = None
+        self.backend = backend
+
         self.source_lang = source_lang
         self.target_lang = target_lang
 
         self.device = _choose_device()
 
-        # Choose model sensibly for the available device/VRAM.
-        chosen_model = _pick_model_name(model_name)
+        # bitsandbytes kernels are CUDA-only.
+        if quantization and self.device.type != "cuda":
+            if log:
+                log(f"[WARN] NLLB quantization '{quantization}' requires CUDA; loading unquantized on CPU.")
+            quantization = None
+        self.quantization = quantization
+
+        # CTranslate2 always stores weights in int8; size the model choice accordingly.
+        weight_quant = "int8" if backend == "ct2" else quantization
+        chosen_model = self._select_model(model_name, weight_quant, log)
+        if self.device.type != "cuda":
+            quantization = self.quantization = None
+
+        # No torch.cuda.empty_cache() here or per batch: it syncs the device and makes the
+        # caching allocator re-cudaMalloc blocks it would otherwise reuse. Fragmentation is
+        # handled by expandable_segments (PYTORCH_CUDA_ALLOC_CONF, set at module import).
+
+        self.model_name = chosen_model
+        if log:
+            quant_note = f", quantization={quantization}" if quantization else ""
+            log(f"[INFO] NLLB model selected: {self.model_name} (device={self.device.type}{quant_note})")
+
+        # Tokenizer is small; keep it on CPU.
+        self.tokenizer = NllbTokenizer.from_pretrained(self.model_name)
+        self.set_languages(source_lang, target_lang)
+
+        # Set by _compile(): static KV cache + bucketed input shapes (CUDA graphs).
+        self._use_static_cache = False
+
+        self.ct2 = None
+        if self.backend == "ct2":
+            try:
+                with _LOAD_LOCK:
+                    self.ct2 = _load_ct2(self.model_name, self.device.type)
+                if log:
+                    log("[INFO] NLLB running on CTranslate2 (int8).")
+                return
+            except Exception as e:
+                if log:
+                    log(f"[WARN] CTranslate2 backend failed, using transformers: {e}")
+                self.backend = "hf"
+                # The model/device were sized for int8 weights; redo it for unquantized HF.
+                self.device = _choose_device()
+                chosen_model = self._select_model(model_name, None, log)
+                if chosen_model != self.model_name:
+                    self.model_name = chosen_model
+                    if log:
+                        log(f"[INFO] NLLB model selected: {self.model_name} (device={self.device.type})")
+                    self.tokenizer = NllbTokenizer.from_pretrained(self.model_name)
+                    self.set_languages(source_lang, target_lang)
+
+        # Weights are cached process-wide; repeated translators skip the reload.
+        with _LOAD_LOCK:
+            self.model, self._generate_lock = _load_nllb(
+                self.model_name, str(self.device), quantization, compile_model
+            )
+
+        if compile_model:
+            self._compile(log)
+
+        if self.device.type == "cuda" and self.model not in _WARMED_UP_MODELS:
+            self._warmup(log)
+
+    def _select_model(
+        self,
+        requested: Optional[str],
+        weight_quant: Optional[str],
+        log: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Chooses the model for the available device/VRAM at the given weight quantization.
+        Moves self.device to CPU if the 3.3B model would not fit the GPU.
+        """
+        chosen_model = _pick_model_name(requested, weight_quant)
 
         # If user explicitly requested the 3.3B model but VRAM is small, prefer CPU for safety.
-        if chosen_model == DEFAULT_MODEL_LARGE and self.device.type == "cuda" and _cuda_total_gib() < 16.0:
+        if (
+            chosen_model == DEFAULT_MODEL_LARGE
+            and self.device.type == "cuda"
+            and cuda_total_gib() < LARGE_MODEL_MIN_VRAM_GIB[weight_quant]
+        ):
             if log:
                 log(
                     "[WARN] NLLB model 'facebook/nllb-200-3.3B' is too large for this GPU. "
                     "Falling back to CPU to avoid CUDA OOM."
                 )
             self.device = torch.device("cpu")
+        return chosen_model
 
-        if self.device.type == "cuda":
-            _set_allocator_hints()
-            # Avoid stale memory from earlier GPU work.
-            try:
-                torch.cuda.empty_cache()
-            except Exception:
-                pass
-
-        self.model_name = chosen_model
-        if log:
-            log(f"[INFO] NLLB model selected: {self.model_name} (device={self.device.type})")
+    def _warmup(self, log: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Runs one generate at the largest default chunk size (full batch of MAX_CHUNK_TOKENS
+        plus language/eos tokens in, ~1.5x that out) so the CUDA caching allocator reserves
+        the typical largest KV-cache/activation blocks up front; later, shorter batches
+        reuse them instead of fragmenting memory. Not sized to MAX_INPUT_TOKENS: that would
+        pin ~3x the memory real chunks use while Whisper may share the GPU.
+        Attempted once per shared model: a failed warmup (e.g. OOM) is not retried by
+        later translators.
+        """
+        _WARMED_UP_MODELS.add(self.model)
+        try:
+            # "a a a ..." truncated to exactly one full chunk (incl. language/eos tokens);
+            # with the static cache, _pad_batch pads it to that length's bucket.
+            input_len = MAX_CHUNK_TOKENS + self._num_special_tokens
+            new_tokens = min(MAX_NEW_TOKENS, input_len * 3 // 2)
+            ids = self.tokenizer("a " * input_len, truncation=True, max_length=input_len)["input_ids"]
+            inputs = self._to_device(self._pad_batch([ids] * DEFAULT_BATCH_SIZE))
+            with self._generate_lock, torch.inference_mode():
+                self.model.generate(
+                    **inputs,
+                    forced_bos_token_id=self._forced_bos_id,
+                    min_new_tokens=new_tokens,
+                    max_new_tokens=new_tokens,
+                    num_beams=self.num_beams,
+                )
+        except Exception as e:
+            if log:
+                log(f"[WARN] NLLB warmup skipped: {e}")
 
-        # Tokenizer is small; keep it on CPU.
-        self.tokenizer = NllbTokenizer.from_pretrained(self.model_name)
+    def _compile(self, log: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Wraps model.forward with torch.compile and pays the compile cost with a short
+        warmup generate, instead of on the first user call. Falls back to eager mode.
+        """
+        if not hasattr(torch, "compile"):
+            if log:
+                log("[WARN] torch.compile is not available in this torch version; using eager mode.")
+            return
+
+        if self.model in _COMPILED_MODELS:
+            # Shared model was already compiled by an earlier translator.
+            self._use_static_cache = self.device.type == "cuda"
+            return
+
+        eager_forward = self.model.forward
+        try:
+            # dynamic=True: chunk/batch lengths vary, avoid recompiling for every shape.
+            if self.model in _IPEX_MODELS:
+                # IPEX registers its own backend: graph capture plus IPEX's fused CPU ops.
+                self.model.forward = torch.compile(eager_forward, backend="ipex", dynamic=True)
+            else:
+                self.model.forward = torch.compile(eager_forward, mode="reduce-overhead", dynamic=True)
+            warmup = self.tokenizer(["Hallo."], return_tensors="pt").to(self.device)
+            with self._generate_lock, torch.inference_mode():
+                self.model.generate(**warmup, forced_bos_token_id=self._forced_bos_id, max_new_tokens=8)
+            _COMPILED_MODELS.add(self.model)
+            # A pre-allocated KV cache keeps shapes fixed so CUDA graphs can be replayed.
+            self._use_static_cache = self.device.type == "cuda"
+            if log:
+                log("[INFO] NLLB model compiled with torch.compile.")
+        except Exception as e:
+            self.model.forward = eager_forward
+            if log:
+                log(f"[WARN] torch.compile failed, using eager mode: {e}")
 
-        # Reduce peak memory during load.
-        model_kwargs = {"low_cpu_mem_usage": True}
+    def set_languages(self, source_lang: str, target_lang: str) -> None:
+        """
+        Switches the translation direction. Tokenizer source language and the forced
+        target-language BOS token are updated together and reused by translate().
+        """
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.tokenizer.src_lang = source_lang
+        self._forced_bos_id = self.tokenizer.convert_tokens_to_ids(target_lang)
+        # Language/eos ids wrapped around every chunk. Setting src_lang refreshes them;
+        # both lists exist on NllbTokenizer in transformers 4.x and 5.x, unlike
+        # build_inputs_with_special_tokens / num_special_tokens_to_add.
+        self._prefix_ids = list(self.tokenizer.prefix_tokens)
+        self._suffix_ids = list(self.tokenizer.suffix_tokens)
+        self._num_special_tokens = len(self._prefix_ids) + len(self._suffix_ids)
+
+    def _pad_batch(self, batch_ids: list[list[int]]) -> dict:
+        """
+        Pads already-tokenized chunks into CPU input tensors (page-locked on CUDA so the
+        host-to-device copy can be asynchronous). With the static cache enabled, pads to
+        the next INPUT_LENGTH_BUCKETS length instead of the batch's longest chunk.
+        """
+        encoded = {"input_ids": batch_ids}
+        if self._use_static_cache:
+            longest = max(len(ids) for ids in batch_ids)
+            bucket = next((b for b in INPUT_LENGTH_BUCKETS if b >= longest), INPUT_LENGTH_BUCKETS[-1])
+            padded = self.tokenizer.pad(encoded, padding="max_length", max_length=bucket, return_tensors="pt")
+        else:
+            padded = self.tokenizer.pad(encoded, padding="longest", return_tensors="pt")
         if self.device.type == "cuda":
-            model_kwargs["torch_dtype"] = torch.float16
+            return {k: v.pin_memory() for k, v in padded.items()}
+        return dict(padded)
 
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, **model_kwargs)
-        self.model.to(self.device)
-        self.model.eval()
+    def _to_device(self, inputs: dict) -> dict:
+        # non_blocking only has an effect for pinned CPU tensors going to CUDA.
+        return {k: v.to(self.device, non_blocking=True) for k, v in inputs.items()}
 
-    def _split_by_sentences(self, text: str, max_chars: int = 400) -> list[str]:
+    def _chunk_by_tokens(self, text: str, max_tokens: int = MAX_CHUNK_TOKENS) -> list[list[int]]:
         """
-        Splits text into ~max_chars chunks using sentence boundaries.
+        Splits text at sentence boundaries into chunks of at most `max_tokens` SentencePiece
+        tokens and returns each chunk's model input ids (language/eos tokens included).
+        Each sentence is encoded once and its ids are reused for the chunk, so nothing is
+        re-tokenized later. A single sentence longer than the limit (run-on transcript
+        sentences, unpunctuated slide text) is split into several chunks; see _split_long().
         """
-        sentences = re.split(r"(?<=[.!?])\s+", (text or "").strip())
-        chunks: list[str] = []
-        current = ""
+        sentences = _split_sentences(text)
+        if not sentences:
+            return []
 
-        for sentence in sentences:
-            if not sentence:
+        limit = max(1, min(max_tokens, MAX_INPUT_TOKENS - self._num_special_tokens))
+        sentence_ids = self.tokenizer(sentences, add_special_tokens=False)["input_ids"]
+
+        chunks: list[list[int]] = []
+        current: list[int] = []
+        for ids in sentence_ids:
+            if not ids:
                 continue
-            if len(current) + len(sentence) <= max_chars:
-                current = (current + " " + sentence).strip() if current else sentence
-            else:
+            if len(ids) > limit:
                 if current:
-                    chunks.append(current.strip())
-                current = sentence
-
+                    chunks.append(current)
+                    current = []
+                chunks.extend(self._split_long(ids, limit))
+                continue
+            if current and len(current) + len(ids) > limit:
+                chunks.append(current)
+                current = []
+            current.extend(ids)
         if current:
-            chunks.append(current.strip())
+            chunks.append(current)
 
-        return chunks
+        return [self._prefix_ids + ids + self._suffix_ids for ids in chunks]
 
-    def translate(self, text: str, max_chars: int = 400, log: Optional[Callable[[str], None]] = None) -> str:
+    def _split_long(self, ids: list[int], limit: int) -> list[list[int]]:
+        """
+        Cuts one over-long sentence's ids into pieces of at most `limit` tokens. Each cut
+        goes after the last comma in the window if there is one, else before the last
+        word-initial ("\u2581") token, else hard at `limit`.
+        """
+        tokens = self.tokenizer.convert_ids_to_tokens(ids)
+        pieces: list[list[int]] = []
+        start = 0
+        while len(ids) - start > limit:
+            end = start + limit
+            cut = next((j for j in range(end, start, -1) if tokens[j - 1].endswith(",")), None)
+            if cut is None:
+                cut = next((j for j in range(end, start, -1) if tokens[j].startswith("\u2581")), end)
+            pieces.append(ids[start:cut])
+            start = cut
+        pieces.append(ids[start:])
+        return pieces
+
+    def _generate(self, inputs: dict, beam_kwargs: dict, log: Optional[Callable[[str], None]] = None):
         """
-        Translates text using NLLB, chunked by sentence for stability.
+        Runs generate() for one encoded batch. If the static KV cache is rejected by this
+        transformers version/model, disables it for this translator and retries once.
         """
-        chunks = self._split_by_sentences(text, max_chars=max_chars)
-        if not chunks:
-            return ""
+        gen_kwargs = dict(
+            forced_bos_token_id=self._forced_bos_id,
+            max_new_tokens=MAX_NEW_TOKENS,
+            num_beams=self.num_beams,
+            no_repeat_ngram_size=3,
+            repetition_penalty=1.1,
+            **beam_kwargs,
+        )
+        # Inference-only path: lower memory than grad-enabled.
+        with self._generate_lock, torch.inference_mode():
+            if self._use_static_cache:
+                try:
+                    return self.model.generate(**inputs, cache_implementation="static", **gen_kwargs)
+                except Exception as e:
+                    self._use_static_cache = False
+                    if log:
+                        log(f"[WARN] Static KV cache unavailable, using dynamic cache: {e}")
+            return self.model.generate(**inputs, **gen_kwargs)
+
+    def _hf_batches(
+        self,
+        all_ids: list[list[int]],
+        groups: list[list[int]],
+        log: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[tuple[list[int], list[str]]]:
+        """
+        Translates each group of chunk indices with transformers generate() and yields
+        (indices, translations) per batch.
+        """
+        # Beam-only options; passing them with greedy decoding just triggers warnings.
+        beam_kwargs = (
+            {"early_stopping": True, "length_penalty": 1.05} if self.num_beams > 1 else {}
+        )
 
-        results: list[str] = []
-        self.tokenizer.src_lang = self.source_lang
-        forced_id = self.tokenizer.convert_tokens_to_ids(self.target_lang)
+        # Pad (and pin) every batch up front so the loop only queues copies and generates.
+        batches = [self._pad_batch([all_ids[i] for i in batch_idx]) for batch_idx in groups]
 
-        for idx, chunk in enumerate(chunks, start=1):
+        next_inputs = None
+        for batch_no, (batch_idx, cpu_inputs) in enumerate(zip(groups, batches), start=1):
             if log:
-                log(f"[INFO] Translating chunk {idx}/{len(chunks)}")
-
-            inputs = self.tokenizer(
-                chunk,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512,
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                log(f"[INFO] Translating batch {batch_no}/{len(batches)} ({len(batch_idx)} chunks)")
 
-            # Inference-only path: lower memory than grad-enabled.
+            # All tensor work (copy, generate, decode) runs under inference_mode. The block
+            # is left before yielding so grad mode never leaks into the caller's code while
+            # this generator is suspended.
             with torch.inference_mode():
-                generated = self.model.generate(
-                    **inputs,
-                    forced_bos_token_id=forced_id,
-                    max_new_tokens=256,
-                    num_beams=4,
-                    early_stopping=True,
-                    no_repeat_ngram_size=3,
-                    length_penalty=1.05,
-                    repetition_penalty=1.1,
-                )
+                inputs = next_inputs if next_inputs is not None else self._to_device(cpu_inputs)
+                # Queue the next batch's async copy before this batch's generate().
+                next_inputs = self._to_device(batches[batch_no]) if batch_no < len(batches) else None
+                generated = self._generate(inputs, beam_kwargs, log)
+                translated = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
 
-            translated = self.tokenizer.batch_decode(generated, skip_special_tokens=True)[0]
-            results.append((translated or "").strip())
+            yield batch_idx, translated
 
-            # Proactively free temporary tensors (helps on small VRAM GPUs).
-            del inputs, generated
-            if self.device.type == "cuda":
-                try:
-                    torch.cuda.empty_cache()
-                except Exception:
-                    pass
+    def _ct2_batches(
+        self,
+        all_ids: list[list[int]],
+        groups: list[list[int]],
+        log: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[tuple[list[int], list[str]]]:
+        """
+        Same as _hf_batches(), on CTranslate2. The HF tokenizer still encodes/decodes;
+        CTranslate2 takes token strings and the target language as decoder prefix.
+        """
+        options = dict(
+            beam_size=self.num_beams,
+            max_decoding_length=MAX_NEW_TOKENS,
+            no_repeat_ngram_size=3,
+            repetition_penalty=1.1,
+        )
+        if self.num_beams > 1:
+            options["length_penalty"] = 1.05
+
+        for batch_no, batch_idx in enumerate(groups, start=1):
+            if log:
+                log(f"[INFO] Translating batch {batch_no}/{len(groups)} ({len(batch_idx)} chunks)")
+
+            source = [self.tokenizer.convert_ids_to_tokens(all_ids[i]) for i in batch_idx]
+            results = self.ct2.translate_batch(
+                source, target_prefix=[[self.target_lang]] * len(source), **options
+            )
+            # Hypotheses start with the target-language prefix token; drop it.
+            generated = [self.tokenizer.convert_tokens_to_ids(r.hypotheses[0][1:]) for r in results]
+            yield batch_idx, self.tokenizer.batch_decode(generated, skip_special_tokens=True)
 
-        return "\n".join(results)
\ No newline at end of file
+    def translate(
+        self,
+        text: str,
+        max_tokens: int = MAX_CHUNK_TOKENS,
+        log: Optional[Callable[[str], None]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> str:
+        """
+        Translates text using NLLB, chunked by sentence (up to `max_tokens` tokens per
+        chunk) for stability. Chunks are translated in padded mini-batches of `batch_size` per generate() call;
+        batches group chunks of similar token length to minimize padding.
+        """
+        return "\n".join(
+            self.translate_iter(text, max_tokens=max_tokens, log=log, batch_size=batch_size, in_order=False)
+        )
+
+    def translate_iter(
+        self,
+        text: str,
+        max_tokens: int = MAX_CHUNK_TOKENS,
+        log: Optional[Callable[[str], None]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        in_order: bool = True,
+    ) -> Iterator[str]:
+        """
+        Like translate(), but yields each chunk's translation (in original order) as soon
+        as it and all earlier chunks are done, so callers can show incremental output.
+        With `in_order` (default), batches hold consecutive chunks so the first lines
+        arrive after the first batch; otherwise batches are grouped by token length
+        (less padding, but output only starts once the chunks before it are done).
+        """
+        all_ids = self._chunk_by_tokens(text, max_tokens=max_tokens)
+        if not all_ids:
+            return
+
+        if in_order:
+            order = list(range(len(all_ids)))
+        else:
+            # Sort chunks by token length so each batch is padded only to its own (similar) maximum.
+            order = sorted(range(len(all_ids)), key=lambda i: len(all_ids[i]))
+        batch_size = max(1, batch_size)
+        groups = [order[s:s + batch_size] for s in range(0, len(order), batch_size)]
+
+        if self.backend == "ct2":
+            batch_results = self._ct2_batches(all_ids, groups, log)
+        else:
+            batch_results = self._hf_batches(all_ids, groups, log)
+
+        # Batches finish out of text order; hold results until the next chunk in order is ready.
+        done: dict[int, str] = {}
+        next_to_yield = 0
+        for batch_idx, translated in batch_results:
+            for i, t in zip(batch_idx, translated):
+                done[i] = (t or "").strip()
+
+            while next_to_yield in done:
+                yield done.pop(next_to_yield)
+                next_to_yield += 1
@@ -7,7 +7,10 @@ Supports extraction, translation, transcription, TTS, and reintegration.
 
 from __future__ import annotations
 
+import asyncio
+import queue
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, ttk
@@ -39,6 +42,17 @@ class App:
     GUI Controller for the Audio PowerPoint Automation Tool.
     """
 
+    # Pending UI calls are applied in batches on a fixed cadence (ms / max calls per tick).
+    UI_DRAIN_INTERVAL_MS = 50
+    UI_DRAIN_BATCH = 200
+    # Log lines are buffered and written to the log panel in one insert per tick.
+    LOG_FLUSH_INTERVAL_MS = 100
+    # Pipeline steps run on one persistent pool (the pipeline driver has its own thread).
+    TASK_POOL_WORKERS = 4
+    # Messages starting with these are mirrored to the Output summary panel.
+    _SUMMARY_PREFIXES = ("[DONE]", "Combined", "Generated", "Translated",
+                         "Saved", "Selected", "Starting", "[WARN]", "[ERROR]")
+
     def __init__(self, root):
         self.root = root
         self.root.title("Audio PowerPoint Automation Tool")
@@ -52,13 +66,41 @@ class App:
         self.language_model_map = TTS_LANGUAGE_MODEL_MAP.copy()
 
         self.steps_vars: dict[str, tuple[tk.BooleanVar, callable]] = {}
+        self.step_stages: dict[str, int] = {}
+        self._ui_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pool = ThreadPoolExecutor(max_workers=self.TASK_POOL_WORKERS, thread_name_prefix="oev")
+        # Set by exit_app(); a running pipeline starts no further stages once set.
+        self._closing = threading.Event()
+        self._pipeline_running = False  # main thread only
+        self._log_buffer: list[str] = []
+        self._log_lock = threading.Lock()
+        # Authoritative progress value; the widget is only ever written, never read back.
+        self._progress_value = 0.0
+        self._progress_lock = threading.Lock()
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self.root.after(self.UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
+        self.root.after(self.LOG_FLUSH_INTERVAL_MS, self._flush_log)
 
     # ====== Thread-safe UI helpers ======
 
     def _ui(self, fn, *args, **kwargs):
         """Schedule any Tk widget call on the main thread."""
-        self.root.after(0, lambda: fn(*args, **kwargs))
+        self._ui_queue.put((fn, args, kwargs))
+
+    def _drain_ui_queue(self):
+        """Main thread: apply queued widget calls in order, then reschedule."""
+        for _ in range(self.UI_DRAIN_BATCH):
+            try:
+                fn, args, kwargs = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                # Report like a plain Tk callback would, but keep draining the queue.
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+        self.root.after(self.UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
 
     def ui_set_text(self, widget, text: str, replace: bool = False):
         """Thread-safe: set/append text in Text/Entry/Label-like widgets."""
@@ -76,9 +118,21 @@ class App:
             self._ui(self.progress_bar.configure, value=value)
 
     def ui_log(self, message: str):
-        """Thread-safe: log to the log panel only."""
-        if hasattr(self, "log_text"):
-            self.ui_set_text(self.log_text, (message.rstrip() + "\n"))
+        """Thread-safe: log to the log panel only (buffered, see _flush_log)."""
+        with self._log_lock:
+            self._log_buffer.append(message.rstrip() + "\n")
+
+    def _flush_log(self):
+        """Main thread: write all buffered log lines with a single insert, then reschedule."""
+        with self._log_lock:
+            pending, self._log_buffer = self._log_buffer, []
+        if pending and hasattr(self, "log_text"):
+            try:
+                self.log_text.insert("end", "".join(pending))
+                self.log_text.see("end")
+            except Exception:
+                pass
+        self.root.after(self.LOG_FLUSH_INTERVAL_MS, self._flush_log)
 
     def ui_output(self, message: str, replace: bool = False):
         """Thread-safe: update output summary panel only."""
@@ -94,24 +148,23 @@ class App:
         self.ui_log(message)
 
         # Only mirror summaries to Output
-        summary_prefixes = ("[DONE]", "Combined", "Generated", "Translated",
-                            "Saved", "Selected", "Starting", "[WARN]", "[ERROR]")
-        if message.startswith(summary_prefixes):
+        if message.startswith(self._SUMMARY_PREFIXES):
             self.ui_output(message)
 
 
     def tick(self, delta: float = 1.0, note: str | None = None):
         """Thread-safe: bump progress a bit and optionally log."""
-        try:
-            current = float(self.progress_bar["value"])
-        except Exception:
-            current = 0.0
-        self.ui_progress(current + delta)
+        with self._progress_lock:
+            self._progress_value += delta
+            value = self._progress_value
+        self.ui_progress(value)
         if note:
             self.log_and_output(note)
 
     def done(self, note: str = "✔ Done"):
         """Thread-safe: mark 100% and log a note."""
+        with self._progress_lock:
+            self._progress_value = 100.0
         self.ui_progress(100.0)
         self.log_and_output(note)
 
@@ -136,15 +189,22 @@ class App:
     def handle_exception(self, context: str, e: Exception):
         self.log_and_output(f"[ERROR] {context}: {e}")
 
-    def _run_task(self, task):
-        threading.Thread(target=task, daemon=True).start()
+    def _run_task(self, task) -> Future:
+        """Run task on the app's worker pool; the Future allows cancelling queued work."""
+        return self._pool.submit(task)
+
+    def exit_app(self):
+        """
+        Exit button and window close: start no further pipeline stages, drop queued steps
+        and leave the Tk main loop. Pool threads are not daemons, so a step that is
+        already running finishes before the process exits.
+        """
+        self._closing.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.root.quit()
 
     def increment_progress(self):
-        try:
-            current = float(self.progress_bar["value"])
-        except Exception:
-            current = 0.0
-        self.ui_progress(current + 1.0)
+        self.tick(1.0)
 
     # ====== UI Layout ======
 
@@ -162,21 +222,24 @@ class App:
         # 2. Steps
         step_frame = tk.LabelFrame(self.root, text="2. Select Steps to Run", font=default_font)
         step_frame.pack(fill="x", padx=10, pady=5)
-        for i, (label, method) in enumerate(
+        # Stage = position in the dependency graph; steps sharing a stage are
+        # independent of each other and run concurrently.
+        for i, (label, method, stage) in enumerate(
             [
-                ("Extract + Convert Audio", self.extract_and_convert_audio),
-                ("Extract Slide Text (.txt)", self.extract_slide_text_txt),
-                ("Transcribe", self.transcribe_audio),
-                ("Translate Audio Transcripts", self.translate_text),
-                ("Translate Slide Text (.txt)", self.translate_slide_text_txt),
-                ("Generate TTS Audio", self.generate_tts),
-                ("Reintegrate Text and Audio (Combined)", self.reintegrate_text_and_audio_combined),
+                ("Extract + Convert Audio", self.extract_and_convert_audio, 0),
+                ("Extract Slide Text (.txt)", self.extract_slide_text_txt, 0),
+                ("Transcribe", self.transcribe_audio, 1),
+                ("Translate Audio Transcripts", self.translate_text, 2),
+                ("Translate Slide Text (.txt)", self.translate_slide_text_txt, 1),
+                ("Generate TTS Audio", self.generate_tts, 3),
+                ("Reintegrate Text and Audio (Combined)", self.reintegrate_text_and_audio_combined, 4),
             ]
         ):
             var = tk.BooleanVar()
             chk = tk.Checkbutton(step_frame, text=label, variable=var, font=default_font)
             chk.grid(row=i // 2, column=i % 2, sticky="w", padx=10, pady=2)
             self.steps_vars[label] = (var, method)
+            self.step_stages[label] = stage
 
         # 3. Language & TTS settings
         lang_frame = tk.LabelFrame(self.root, text="3. Language Settings", font=default_font)
@@ -204,12 +267,13 @@ class App:
         control_frame = tk.Frame(self.root)
         control_frame.pack(fill="x", padx=10, pady=10)
 
-        tk.Button(
+        self.run_button = tk.Button(
             control_frame,
             text="Run Selected Steps",
             command=self.run_selected_steps,
             font=default_font,
-        ).pack(side="left", padx=5)
+        )
+        self.run_button.pack(side="left", padx=5)
 
         ack_text = (
             "I understand this software uses AI tools/technology for translation. "
@@ -228,7 +292,7 @@ class App:
         tk.Button(
             control_frame,
             text="Exit",
-            command=self.root.quit,
+            command=self.exit_app,
             font=default_font,
         ).pack(side="left", padx=5)
 
@@ -261,190 +325,185 @@ class App:
     # ====== Run Steps ======
 
     def run_selected_steps(self):
-        
+        # One pipeline at a time; the Run button is disabled meanwhile, this guards re-entry.
+        if self._pipeline_running:
+            return
+
         # Must acknowledge disclaimer before running
-        if not getattr(self, "acknowledge_var", tk.BooleanVar(value=False)).get():
+        if not self.acknowledge_var.get():
             self.log_and_output("[WARN] Please confirm the acknowledgement checkbox before running any steps.")
             return
         
-        self.progress_bar["value"] = 0
+        with self._progress_lock:
+            self._progress_value = 0.0
         selected_steps = [(name, method) for name, (var, method) in self.steps_vars.items() if var.get()]
         total = max(1, len(selected_steps))
         self.progress_bar["maximum"] = total
         self.ui_progress(0)
 
-        def run_step(index=0):
-            if index >= len(selected_steps):
-                self.done("All selected steps completed.")
-                return
-            name, method = selected_steps[index]
+        self._pipeline_running = True
+        self.run_button.configure(state="disabled")
+        # The driver only awaits steps; on its own daemon thread it never occupies a pool
+        # worker and never delays exit.
+        threading.Thread(
+            target=lambda: asyncio.run(self._run_pipeline(selected_steps)),
+            name="oev-pipeline",
+            daemon=True,
+        ).start()
+
+    def _pipeline_finished(self):
+        """Main thread: allow the next run."""
+        self._pipeline_running = False
+        self.run_button.configure(state="normal")
+
+    async def _run_pipeline(self, selected_steps):
+        """
+        Runs the selected steps stage by stage. Steps within a stage are independent
+        (e.g. audio extraction and slide-text extraction) and run concurrently on the
+        app's worker pool; the next stage starts once the current one has finished.
+        """
+        stages: dict[int, list] = {}
+        for name, method in selected_steps:
+            stages.setdefault(self.step_stages.get(name, 0), []).append((name, method))
+
+        async def run_step(name, method):
             self.log_and_output(f"Starting: {name}")
-            method(lambda: run_step(index + 1))
+            await asyncio.wrap_future(self._run_task(method))
 
-        run_step()
+        try:
+            for stage in sorted(stages):
+                if self._closing.is_set():
+                    return
+                await asyncio.gather(*(run_step(name, method) for name, method in stages[stage]))
+
+            self.done("All selected steps completed.")
+        except (RuntimeError, asyncio.CancelledError):
+            # Pool shut down / queued steps cancelled by exit_app().
+            if not self._closing.is_set():
+                raise
+        finally:
+            self._ui(self._pipeline_finished)
 
     # ====== Pipeline Functions ======
 
-    def extract_and_convert_audio(self, on_complete=None):
-        def task():
-            try:
-                pptx_path = Path(self.pptx_path.get())
-                base_dir = self.get_base_path()
-                media_dir = base_dir / "media"
-                wav_dir = base_dir / "converted_wav"
-
-                extracted = extract_audio_from_pptx(pptx_path, base_dir, log_fn=self.log_and_output)
-                self.log_and_output(f"Extracted {len(extracted)} audio files to: {media_dir}")
-
-                converted = convert_audio_to_wav(media_dir, wav_dir, log_fn=self.log_and_output)
-                self.log_and_output(f"Converted {len(converted)} audio files to WAV in: {wav_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Extract + Convert Audio", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
-
-        self._run_task(task)
-
-    def extract_slide_text_txt(self, on_complete=None):
-        def task():
-            try:
-                pptx_path = Path(self.pptx_path.get())
-                output_dir = self.get_subdir("slide_text_txt")
-                extracted = extract_slide_text(pptx_path, output_dir)
-                self.log_and_output(f"Extracted {len(extracted)} text files to: {output_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Extract Slide Text", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
-
-        self._run_task(task)
-
-    def transcribe_audio(self, on_complete=None):
-        def task():
-            try:
-                input_dir = self.get_subdir("converted_wav")
-                output_dir = self.get_subdir("transcripts")
-                transcribed = transcribe_audio_files(input_dir, output_dir, log_fn=self.log_and_output)
-                self.log_and_output(f"{len(transcribed)} files transcribed and saved in: {output_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Transcribe Audio", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
-
-        self._run_task(task)
-
-    def translate_text(self, on_complete=None):
-        def task():
-            try:
-                input_dir = self.get_subdir("transcripts")
-                output_dir = self.get_subdir("translated_text")
-                src, tgt = self.get_translation_languages()
-                translated = translate_transcript_files(input_dir, output_dir, src, tgt, self.log_and_output, self.log_and_output)
-                self.log_and_output(f"Translated {len(translated)} transcript files to: {output_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Translate Audio Transcripts", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
-
-        self._run_task(task)
-
-    def translate_slide_text_txt(self, on_complete=None):
-        def task():
-            try:
-                input_dir = self.get_subdir("slide_text_txt")
-                output_dir = self.get_subdir("translated_text_txt")
-                src, tgt = self.get_translation_languages()
-                translated = translate_text_files(input_dir, output_dir, src, tgt, self.log_and_output, self.log_and_output)
-                self.log_and_output(f"Translated {len(translated)} slide text files to: {output_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Translate Slide Text", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
-
-        self._run_task(task)
-
-    def generate_tts(self, on_complete=None):
-        def task():
-            try:
-                base_dir = self.get_base_path()
-                input_dir = self.get_subdir("translated_text")
-                output_dir = self.get_subdir("tts_audio")
-                src, tgt = self.get_translation_languages()
-
-                candidates = [
-                    base_dir / "media",
-                    base_dir / "converted_wav",
-                    base_dir / "original_audio",
-                    base_dir / "audio",
-                ]
-                original_audio_dir = next((c for c in candidates if c.exists()), None)
-                if original_audio_dir is None:
-                    self.log_and_output(
-                        "[INFO] No original audio folder found (media/, converted_wav/, "
-                        "original_audio/, audio/). Auto-tempo will be skipped."
-                    )
-
-                tts_lang = self.language.get()
-
-                audio_files = text_to_speech(
-                    text_dir=input_dir,
-                    output_dir=output_dir,
-                    source_lang=src,
-                    target_lang=tgt,
-                    model_map=self.language_model_map,
-                    log=self.log_and_output,
-                    output=self.log_and_output,
-                    original_audio_dir=original_audio_dir,
-                    auto_deadband_sec=AUTO_DEADBAND_SEC,
-                    auto_deadband_ratio=AUTO_DEADBAND_RATIO,
-                    auto_clamp_bounds=AUTO_CLAMP_BOUNDS,
-                    tts_lang=tts_lang,
-                )
+    def extract_and_convert_audio(self):
+        try:
+            pptx_path = Path(self.pptx_path.get())
+            base_dir = self.get_base_path()
+            media_dir = base_dir / "media"
+            wav_dir = base_dir / "converted_wav"
 
-                self.log_and_output(f"Generated {len(audio_files)} TTS audio files to: {output_dir}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Generate TTS Audio", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
+            extracted = extract_audio_from_pptx(pptx_path, base_dir, log_fn=self.log_and_output)
+            self.log_and_output(f"Extracted {len(extracted)} audio files to: {media_dir}")
 
-        self._run_task(task)
+            converted = convert_audio_to_wav(media_dir, wav_dir, log_fn=self.log_and_output)
+            self.log_and_output(f"Converted {len(converted)} audio files to WAV in: {wav_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Extract + Convert Audio", e)
 
-    def reintegrate_text_and_audio_combined(self, on_complete=None):
-        def task():
-            try:
-                pptx = Path(self.pptx_path.get())
-                base = self.get_base_path()
-                output = pptx.with_name(pptx.stem + "_final_combined.pptx")
-
-                reintegrate_text_and_audio(
-                    pptx,
-                    base / "translated_text_txt",
-                    base / "tts_audio",
-                    output,
-                    log_fn=self.log_and_output,
-                    output_fn=self.log_and_output,
+    def extract_slide_text_txt(self):
+        try:
+            pptx_path = Path(self.pptx_path.get())
+            output_dir = self.get_subdir("slide_text_txt")
+            extracted = extract_slide_text(pptx_path, output_dir)
+            self.log_and_output(f"Extracted {len(extracted)} text files to: {output_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Extract Slide Text", e)
+
+    def transcribe_audio(self):
+        try:
+            input_dir = self.get_subdir("converted_wav")
+            output_dir = self.get_subdir("transcripts")
+            transcribed = transcribe_audio_files(input_dir, output_dir, log_fn=self.log_and_output)
+            self.log_and_output(f"{len(transcribed)} files transcribed and saved in: {output_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Transcribe Audio", e)
+
+    def translate_text(self):
+        try:
+            input_dir = self.get_subdir("transcripts")
+            output_dir = self.get_subdir("translated_text")
+            src, tgt = self.get_translation_languages()
+            translated = translate_transcript_files(input_dir, output_dir, src, tgt, self.log_and_output, self.log_and_output)
+            self.log_and_output(f"Translated {len(translated)} transcript files to: {output_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Translate Audio Transcripts", e)
+
+    def translate_slide_text_txt(self):
+        try:
+            input_dir = self.get_subdir("slide_text_txt")
+            output_dir = self.get_subdir("translated_text_txt")
+            src, tgt = self.get_translation_languages()
+            translated = translate_text_files(input_dir, output_dir, src, tgt, self.log_and_output, self.log_and_output)
+            self.log_and_output(f"Translated {len(translated)} slide text files to: {output_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Translate Slide Text", e)
+
+    def generate_tts(self):
+        try:
+            base_dir = self.get_base_path()
+            input_dir = self.get_subdir("translated_text")
+            output_dir = self.get_subdir("tts_audio")
+            src, tgt = self.get_translation_languages()
+
+            candidates = [
+                base_dir / "media",
+                base_dir / "converted_wav",
+                base_dir / "original_audio",
+                base_dir / "audio",
+            ]
+            original_audio_dir = next((c for c in candidates if c.exists()), None)
+            if original_audio_dir is None:
+                self.log_and_output(
+                    "[INFO] No original audio folder found (media/, converted_wav/, "
+                    "original_audio/, audio/). Auto-tempo will be skipped."
                 )
-                self.log_and_output(f"Combined reintegrated PPTX saved to: {output}")
-                self.increment_progress()
-            except Exception as e:
-                self.handle_exception("Reintegrate Text and Audio", e)
-            finally:
-                if on_complete:
-                    self.root.after(0, on_complete)
 
-        self._run_task(task)
+            tts_lang = self.language.get()
+
+            audio_files = text_to_speech(
+                text_dir=input_dir,
+                output_dir=output_dir,
+                source_lang=src,
+                target_lang=tgt,
+                model_map=self.language_model_map,
+                log=self.log_and_output,
+                output=self.log_and_output,
+                original_audio_dir=original_audio_dir,
+                auto_deadband_sec=AUTO_DEADBAND_SEC,
+                auto_deadband_ratio=AUTO_DEADBAND_RATIO,
+                auto_clamp_bounds=AUTO_CLAMP_BOUNDS,
+                tts_lang=tts_lang,
+            )
+
+            self.log_and_output(f"Generated {len(audio_files)} TTS audio files to: {output_dir}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Generate TTS Audio", e)
+
+    def reintegrate_text_and_audio_combined(self):
+        try:
+            pptx = Path(self.pptx_path.get())
+            base = self.get_base_path()
+            output = pptx.with_name(pptx.stem + "_final_combined.pptx")
+
+            reintegrate_text_and_audio(
+                pptx,
+                base / "translated_text_txt",
+                base / "tts_audio",
+                output,
+                log_fn=self.log_and_output,
+                output_fn=self.log_and_output,
+            )
+            self.log_and_output(f"Combined reintegrated PPTX saved to: {output}")
+            self.increment_progress()
+        except Exception as e:
+            self.handle_exception("Reintegrate Text and Audio", e)
 
 
 # ====== Main Loop ======
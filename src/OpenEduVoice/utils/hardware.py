@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import functools
+import os
+
+
+def physical_cpu_count() -> int:
+    """
+    Number of physical cores (SMT siblings fight over the same SIMD units in GEMMs).
+    Uses psutil when installed; otherwise assumes 2 threads per core. Never raises.
+    """
+    try:
+        import psutil  # optional
+        physical = psutil.cpu_count(logical=False)
+        if physical:
+            return int(physical)
+    except Exception:
+        pass
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+@functools.lru_cache(maxsize=1)
+def cuda_total_gib() -> float:
+    """
+    Total memory of CUDA device 0 in GiB, or 0.0 if CUDA is unavailable. Never raises.
+    Device properties don't change within a process, so the driver is queried once.
+    """
+    try:
+        import torch  # local import: callers may run without torch installed
+
+        if not torch.cuda.is_available():
+            return 0.0
+        return float(torch.cuda.get_device_properties(0).total_memory) / (1024 ** 3)
+    except Exception:
+        return 0.0